@@ -1,7 +1,7 @@
 import logging
 import os
 import tempfile
-from typing import Optional, OrderedDict
+from typing import Dict, Optional, Set
 
 import pandas as pd
 import requests
@@ -27,6 +27,9 @@ class DatasetManager:
 
     def __init__(self):
         self.dataset_path = DATASET_PATH
+        # Last dataset loaded or pushed by this instance, so consecutive calls (e.g.
+        # one insert per agency in sequential mode) don't download it again
+        self._cached_dataset: Optional[Dataset] = None
         self.api = HfApi()
         self.token = HfFolder.get_token()
         if not self.token:
@@ -35,13 +38,13 @@ class DatasetManager:
                 "Please login using `huggingface-cli login`."
             )
 
-    def insert(self, new_data: OrderedDict, allow_update: bool = False):
+    def insert(self, new_data: Dict[str, list], allow_update: bool = False):
         """
         Insert new rows into the dataset, ignoring duplicates by default based on 'unique_id'.
         If 'allow_update' is True, then any rows with existing 'unique_id' are overwritten
         with values from 'new_data'. Afterwards, push the result to the Hugging Face Hub.
 
-        :param new_data: An OrderedDict of data to insert.
+        :param new_data: A dict of columns (column name -> list of values) to insert.
         :param allow_update: If True, overwrite rows that already exist (same 'unique_id').
                             If False (default), skip those duplicates.
         """
@@ -49,18 +52,23 @@ class DatasetManager:
         if dataset is None:
             logging.info("No existing dataset found. Creating from scratch...")
             # If there is no existing dataset, just create a new one from new_data
-            dataset = Dataset.from_dict(new_data)
+            # (built through a Dataset so the column types match the existing flow)
+            df = Dataset.from_dict(new_data).to_pandas()
         else:
             # Merge or update new rows into the existing dataset
-            dataset = self._merge_new_into_dataset(
+            df = self._merge_new_into_dataset(
                 dataset, new_data, allow_update=allow_update
             )
+            if df is None:
+                # Nothing changed, so skip re-uploading the dataset and its CSVs
+                return
 
-        # Sort the dataset before pushing
-        dataset = self._sort_dataset(dataset)
+        # Sort the data before pushing, converting to a HF Dataset only once
+        df = self._sort_df(df)
+        dataset = Dataset.from_pandas(df, preserve_index=False)
 
         # Push updated dataset (and CSVs) to the Hub
-        self._push_dataset_and_csvs(dataset)
+        self._push_dataset_and_csvs(dataset, df)
 
     def update(self, updated_df: pd.DataFrame):
         """
@@ -76,13 +84,14 @@ class DatasetManager:
             return
 
         # Apply row-by-row updates
-        dataset = self._apply_updates(dataset, updated_df)
+        df = self._apply_updates(dataset, updated_df)
 
-        # Sort again after updates
-        dataset = self._sort_dataset(dataset)
+        # Sort again after updates, converting to a HF Dataset only once
+        df = self._sort_df(df)
+        dataset = Dataset.from_pandas(df, preserve_index=False)
 
         # Push updated dataset (and CSVs) to the Hub
-        self._push_dataset_and_csvs(dataset)
+        self._push_dataset_and_csvs(dataset, df)
 
     def get(
         self, min_date: str, max_date: str, agency: Optional[str] = None
@@ -121,28 +130,50 @@ class DatasetManager:
 
         return df
 
+    def get_existing_urls(self) -> Set[str]:
+        """
+        Return the set of article URLs already stored in the dataset, so that scrapers
+        can skip fetching articles ingested by a previous run.
+
+        :return: A set with the 'url' of every row, or an empty set if there is no dataset.
+        """
+        dataset = self._load_existing_dataset()
+        if dataset is None:
+            return set()
+
+        # Only decode the 'url' column instead of converting the whole dataset
+        return set(dataset["url"])
+
     def _load_existing_dataset(self) -> Optional[Dataset]:
         """
         Load an existing dataset from the Hugging Face Hub, or return None if not found.
+        The dataset is cached after the first load (and replaced on every push), so
+        later calls on this instance reuse it instead of downloading it again.
         """
+        if self._cached_dataset is not None:
+            return self._cached_dataset
+
         try:
             existing_dataset = load_dataset(self.dataset_path, split="train")
             logging.info(
                 f"Existing dataset loaded from {self.dataset_path}. "
                 f"\nRow count: {len(existing_dataset)}"
             )
+            self._cached_dataset = existing_dataset
             return existing_dataset
         except DatasetNotFoundError:
             logging.info(f"No existing dataset found at {self.dataset_path}.")
             return None
 
     def _merge_new_into_dataset(
-        self, hf_dataset: Dataset, new_data: OrderedDict, allow_update: bool = False
-    ) -> Dataset:
+        self, hf_dataset: Dataset, new_data: Dict[str, list], allow_update: bool = False
+    ) -> Optional[pd.DataFrame]:
         """
         Merge new rows into the existing HF Dataset. If 'allow_update' is False,
         we skip duplicates (based on 'unique_id'). If 'allow_update' is True,
         we overwrite matching duplicates with data from 'new_data'.
+        The merged rows are returned as a DataFrame, or None if the dataset would be
+        left unchanged (no new rows and no updates).
         """
         df_existing = hf_dataset.to_pandas()
         df_new = pd.DataFrame(new_data)
@@ -163,45 +194,49 @@ class DatasetManager:
         df_existing.set_index("unique_id", inplace=True)
         df_new.set_index("unique_id", inplace=True)
 
+        # A single membership mask tells duplicates and truly new rows apart
+        is_duplicate = df_new.index.isin(df_existing.index)
+        df_missing = df_new[~is_duplicate]
+
         if allow_update:
             # Overwrite existing rows with new data if there's a matching unique_id
             df_existing.update(df_new)
 
-            # Find truly new items (unique_ids not in df_existing)
-            missing_ids = df_new.index.difference(df_existing.index)
-            if not missing_ids.empty:
-                logging.info(f"Inserting {len(missing_ids)} brand new rows.")
-                df_existing = pd.concat([df_existing, df_new.loc[missing_ids]], axis=0)
+            # Append truly new items (unique_ids not in df_existing)
+            if not df_missing.empty:
+                logging.info(f"Inserting {len(df_missing)} brand new rows.")
+                df_existing = pd.concat([df_existing, df_missing], axis=0)
             else:
                 logging.info(
                     "All 'unique_id's in 'new_data' already existed and were updated."
                 )
         else:
             # If not updating, skip duplicates
-            duplicates = df_new.index.intersection(df_existing.index)
-            if not duplicates.empty:
+            duplicate_count = int(is_duplicate.sum())
+            if duplicate_count:
                 logging.info(
-                    f"Skipping {len(duplicates)} duplicates (already in dataset)."
+                    f"Skipping {duplicate_count} duplicates (already in dataset)."
                 )
 
-            # Filter to only new rows (unique_id not present in the existing dataset)
-            df_filtered = df_new.loc[df_new.index.difference(df_existing.index)]
-            if df_filtered.empty:
+            # Keep only new rows (unique_id not present in the existing dataset)
+            if df_missing.empty:
                 logging.info("No new unique items to add; dataset is up to date.")
+                return None
             else:
-                logging.info(f"Adding {len(df_filtered)} new items.")
-                df_existing = pd.concat([df_existing, df_filtered], axis=0)
+                logging.info(f"Adding {len(df_missing)} new items.")
+                df_existing = pd.concat([df_existing, df_missing], axis=0)
 
         df_existing.reset_index(inplace=True)
 
-        # Convert back to a HF Dataset
-        return Dataset.from_pandas(df_existing, preserve_index=False)
+        return df_existing
 
-    def _apply_updates(self, hf_dataset: Dataset, updated_df: pd.DataFrame) -> Dataset:
+    def _apply_updates(
+        self, hf_dataset: Dataset, updated_df: pd.DataFrame
+    ) -> pd.DataFrame:
         """
         For each row in 'updated_df', update matching rows in the existing dataset by 'unique_id'.
         If new columns are present, they will be added to the DataFrame with default None,
-        then filled for any matching row.
+        then filled for any matching row. The updated rows are returned as a DataFrame.
         """
         df = hf_dataset.to_pandas()
 
@@ -227,32 +262,32 @@ class DatasetManager:
         df.reset_index(drop=False, inplace=True)
         updated_df.reset_index(drop=False, inplace=True)
 
-        return Dataset.from_pandas(df, preserve_index=False)
+        return df
 
-    def _sort_dataset(self, hf_dataset: Dataset) -> Dataset:
+    def _sort_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Sort the dataset by 'agency' ascending and 'published_at' descending using pandas,
-        then convert back to a HF Dataset.
+        Sort the rows by 'agency' ascending and 'published_at' descending, in place.
+        Sorting the DataFrame directly avoids a HF Dataset <-> pandas round trip.
         """
-        df = hf_dataset.to_pandas()
-
         # If 'published_at' is a datetime or something else, you'll want to parse or coerce properly.
         # For simplicity, we'll assume 'published_at' is comparable in descending order:
         df.sort_values(
             by=["agency", "published_at"], ascending=[True, False], inplace=True
         )
-        return Dataset.from_pandas(df, preserve_index=False)
+        return df
 
-    def _push_dataset_and_csvs(self, dataset: Dataset):
+    def _push_dataset_and_csvs(self, dataset: Dataset, df: pd.DataFrame):
         """
         Push the HF Dataset to the Hub and generate CSV variants for easy download.
         Additionally, push a reduced version of the dataset (govbrnews-small) containing only
         'published_at', 'agency', 'title', and 'url' columns.
-        """
-        # Convert the dataset to a Pandas DataFrame once
-        df = dataset.to_pandas()
 
+        :param dataset: The HF Dataset to push.
+        :param df: The Pandas DataFrame the dataset was built from, reused for the CSVs
+                   instead of converting the dataset back to pandas.
+        """
         self._push_dataset_to_hub(dataset)
+        self._cached_dataset = dataset
         self._push_reduced_dataset(df)
         self._push_global_csv(dataset)
         self._push_csvs_by_agency(df)
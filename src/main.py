@@ -85,7 +85,7 @@ def main():
     scraper_parser.add_argument(
         "--sequential",
         action="store_true",
-        help="Process and upload each agency's news sequentially.",
+        help="Upload each agency's news as soon as it is scraped, instead of all at once at the end. Agencies are scraped concurrently either way.",
     )
     scraper_parser.add_argument(
         "--allow-update",
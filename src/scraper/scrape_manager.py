@@ -1,8 +1,9 @@
 import hashlib
 import logging
 import os
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from functools import lru_cache
 from typing import Dict, List
 
 import yaml
@@ -14,6 +15,28 @@ logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Agencies are scraped a few at a time; they all share www.gov.br, so keep this small
+MAX_CONCURRENT_AGENCIES = 5
+
+# Prefer the LibYAML C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=1)
+def _load_agencies(file_path: str, mtime_ns: int) -> Dict[str, str]:
+    """
+    Load the agency-to-URL mapping from a YAML file. The result is cached per file
+    modification time, so the file is parsed again only if it changes; callers must
+    not modify it.
+
+    :param file_path: The path of the YAML file.
+    :param mtime_ns: The file's modification time, used as part of the cache key.
+    :return: A dictionary mapping agency keys to URLs.
+    """
+    # Reading bytes lets the C loader decode the file itself
+    with open(file_path, "rb") as f:
+        return yaml.load(f, Loader=YAML_LOADER)["agencies"]
+
 
 class ScrapeManager:
     """
@@ -24,7 +47,7 @@ class ScrapeManager:
         ready for dataset creation and analysis.
       - Generating unique identifiers for news items based on their attributes (agency,
         published date, and title).
-      - Converting raw data from a list-of-dictionaries format into a columnar (OrderedDict) format.
+      - Converting raw data from a list-of-dictionaries format into a columnar (dict of lists) format.
       - Merging new data with an existing dataset, ensuring no duplicates by comparing unique IDs.
       - Sorting the combined dataset by specified criteria (e.g., agency and publication date).
       - Preparing the final processed data into columnar format suitable for integration with
@@ -45,8 +68,7 @@ class ScrapeManager:
         script_dir = os.path.dirname(os.path.abspath(__file__))
         file_path = os.path.join(script_dir, file_name)
 
-        with open(file_path, "r") as f:
-            agencies = yaml.safe_load(f)["agencies"]
+        agencies = _load_agencies(file_path, os.stat(file_path).st_mtime_ns)
 
         if agency:
             if agency in agencies:
@@ -65,13 +87,15 @@ class ScrapeManager:
         allow_update: bool = False,
     ):
         """
-        Executes the web scraping process for the given agencies, date range,
-        and whether the scraping should happen sequentially or in bulk.
+        Executes the web scraping process for the given agencies and date range.
+        Agencies are always scraped concurrently; 'sequential' only decides whether
+        the data is uploaded after each agency or once at the end.
 
         :param agencies: A list of agency names to scrape news from. If None, all agencies are scraped.
         :param min_date: The minimum date for filtering news.
         :param max_date: The maximum date for filtering news.
-        :param sequential: Whether to scrape sequentially (True) or in bulk (False).
+        :param sequential: Whether to upload the data of each agency as soon as it is
+                           scraped (True) or all of it at once at the end (False).
         :param allow_update: If True, overwrite existing entries in the dataset.
         """
         try:
@@ -88,37 +112,57 @@ class ScrapeManager:
                 # Load all agency URLs if agencies list is None or empty
                 all_urls = self._load_urls_from_yaml("site_urls.yaml")
 
+            # Without allow_update, articles already in the dataset are dropped at insert
+            # time anyway, so let the scrapers skip fetching them altogether.
+            known_urls = (
+                set() if allow_update else self.dataset_manager.get_existing_urls()
+            )
+
             webscrapers = [
-                WebScraper(min_date, url, max_date=max_date) for url in all_urls
+                WebScraper(min_date, url, max_date=max_date, known_urls=known_urls)
+                for url in all_urls
             ]
 
-            if sequential:
-                for scraper in webscrapers:
-                    scraped_data = scraper.scrape_news()
-                    if scraped_data:
-                        logging.info(
-                            f"Appending news for {scraper.agency} to HF dataset."
-                        )
-                        self._process_and_upload_data(scraped_data, allow_update)
-                    else:
-                        logging.info(f"No news found for {scraper.agency}.")
-            else:
-                all_news_data = []
-                for scraper in webscrapers:
-                    scraped_data = scraper.scrape_news()
-                    if scraped_data:
-                        all_news_data.extend(scraped_data)
-                    else:
-                        logging.info(f"No news found for {scraper.agency}.")
-
-                if all_news_data:
-                    logging.info("Appending all collected news to HF dataset.")
-                    self._process_and_upload_data(all_news_data, allow_update)
+            # Agencies are scraped concurrently, while uploads stay on this thread
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_AGENCIES) as executor:
+                results = executor.map(self._scrape_agency, webscrapers)
+
+                if sequential:
+                    for scraper, scraped_data in zip(webscrapers, results):
+                        if scraped_data:
+                            logging.info(
+                                f"Appending news for {scraper.agency} to HF dataset."
+                            )
+                            self._process_and_upload_data(scraped_data, allow_update)
+                        else:
+                            logging.info(f"No news found for {scraper.agency}.")
                 else:
-                    logging.info("No news found for any agency.")
+                    all_news_data = []
+                    for scraper, scraped_data in zip(webscrapers, results):
+                        if scraped_data:
+                            all_news_data.extend(scraped_data)
+                        else:
+                            logging.info(f"No news found for {scraper.agency}.")
+
+                    if all_news_data:
+                        logging.info("Appending all collected news to HF dataset.")
+                        self._process_and_upload_data(all_news_data, allow_update)
+                    else:
+                        logging.info("No news found for any agency.")
         except ValueError as e:
             logging.error(e)
 
+    def _scrape_agency(self, scraper: WebScraper) -> List[Dict[str, str]]:
+        """
+        Scrape all news of a single agency and release its HTTP session.
+        Runs on a worker thread, so it must not touch the dataset manager.
+
+        :param scraper: The WebScraper of the agency.
+        :return: The list of news items scraped.
+        """
+        with scraper:
+            return scraper.scrape_news()
+
     def _process_and_upload_data(self, new_data, allow_update: bool):
         """
         Process the news data and upload it to the dataset, with the option to update existing entries.
@@ -129,36 +173,42 @@ class ScrapeManager:
         new_data = self._preprocess_data(new_data)
         self.dataset_manager.insert(new_data, allow_update=allow_update)
 
-    def _preprocess_data(self, data: List[Dict[str, str]]) -> OrderedDict:
+    def _preprocess_data(self, data: List[Dict[str, str]]) -> Dict[str, list]:
         """
-        Preprocess data by:z
+        Preprocess data by:
         - Adding the unique_id column.
+        - Dropping items whose unique_id was already seen in the batch.
         - Reordering columns.
 
         :param data: List of news items as dictionaries.
-        :return: An OrderedDict with the processed data.
+        :return: A dict of columns with the processed data.
         """
-        # Generate unique_id for each record
+        # Generate unique_id for each record, keeping the first item of each id
+        unique_items = {}
         for item in data:
             item["unique_id"] = self._generate_unique_id(
                 item.get("agency", ""),
                 item.get("published_at", ""),
                 item.get("title", ""),
             )
+            unique_items.setdefault(item["unique_id"], item)
+
+        if len(unique_items) < len(data):
+            logging.info(
+                f"Dropping {len(data) - len(unique_items)} duplicated news items."
+            )
+            data = list(unique_items.values())
 
         # Convert to columnar format
         column_data = {
             key: [item.get(key, None) for item in data] for key in data[0].keys()
         }
 
-        # Reorder columns
-        ordered_column_data = OrderedDict()
-        if "unique_id" in column_data:
-            ordered_column_data["unique_id"] = column_data.pop("unique_id")
-        if "agency" in column_data:
-            ordered_column_data["agency"] = column_data.pop("agency")
-        if "published_at" in column_data:
-            ordered_column_data["published_at"] = column_data.pop("published_at")
+        # Reorder columns (plain dicts keep insertion order)
+        leading_columns = ("unique_id", "agency", "published_at")
+        ordered_column_data = {
+            key: column_data.pop(key) for key in leading_columns if key in column_data
+        }
         ordered_column_data.update(column_data)
 
         return ordered_column_data
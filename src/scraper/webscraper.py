@@ -1,13 +1,17 @@
 import logging
 import random
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
 import requests
-from bs4 import BeautifulSoup
-from markdownify import markdownify as md
+from bs4 import BeautifulSoup, SoupStrainer
+from markdownify import MarkdownConverter
+from requests.adapters import HTTPAdapter
 from retry import retry
 
 # Set up logging configuration
@@ -15,19 +19,64 @@ logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-SLEEP_TIME_INTERVAL = (0.5, 1.5)
+# Small random pause between requests, just enough to avoid hitting the server in lockstep
+SLEEP_TIME_INTERVAL = (0, 0.3)
+# Statuses meaning the server is throttling us; these are retried with backoff
+RETRY_STATUS_CODES = {429, 503}
+# Articles of a listing page fetched at the same time, per agency
+MAX_CONCURRENT_ARTICLES = 4
+# Requests in flight to the same host across all scrapers. Every agency lives on
+# www.gov.br, so this caps the total load no matter how many agencies run at once
+MAX_CONCURRENT_REQUESTS_PER_HOST = 4
+
+# Only build the parts of each page that are actually read into the soup
+# (the class is matched with a regex because the strainer sees the raw, unsplit attribute)
+LISTING_STRAINER = SoupStrainer(
+    ["article", "ul"], class_=re.compile(r"(^|\s)(tileItem|noticias)(\s|$)")
+)
+ARTICLE_STRAINER = SoupStrainer("div", id="content")
+
+DATE_PATTERN = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b")
+TITLE_UNDERLINE_PATTERN = re.compile(r"^=+$")
+
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """
+    Return the semaphore shared by every request to the host of the given URL.
+
+    :param url: The URL about to be requested.
+    :return: The semaphore limiting the concurrent requests to that host.
+    """
+    host = urlsplit(url).netloc
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(
+                MAX_CONCURRENT_REQUESTS_PER_HOST
+            )
+        return _host_semaphores[host]
 
 
 class WebScraper:
-    def __init__(self, min_date: str, base_url: str, max_date: Optional[str] = None):
+    def __init__(
+        self,
+        min_date: str,
+        base_url: str,
+        max_date: Optional[str] = None,
+        known_urls: Optional[Set[str]] = None,
+    ):
         """
         Initialize the scraper with minimum and maximum dates, and base URL.
 
         :param min_date: The minimum date for scraping news (format: YYYY-MM-DD).
         :param base_url: The base URL of the agency's news page.
         :param max_date: The maximum date for scraping news (format: YYYY-MM-DD).
+        :param known_urls: URLs of articles already scraped. Their content is not fetched again.
         """
         self.base_url = base_url
+        self.known_urls = known_urls if known_urls is not None else set()
         self.min_date = datetime.strptime(min_date, "%Y-%m-%d").date()
         if max_date:
             self.max_date = datetime.strptime(max_date, "%Y-%m-%d").date()
@@ -35,6 +84,26 @@ class WebScraper:
             self.max_date = None
         self.news_data = []
         self.agency = self.get_agency_name()
+        # A single session per scraper reuses the keep-alive connections to the agency's
+        # host, with one pooled connection per concurrent article fetch. Agencies are
+        # served over HTTPS only, so the single pool is kept for that scheme.
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_ARTICLES),
+        )
+
+    def close(self):
+        """
+        Close the underlying HTTP session, releasing its pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self) -> "WebScraper":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def get_agency_name(self) -> str:
         """
@@ -97,17 +166,24 @@ class WebScraper:
     def fetch_page(self, url: str) -> Optional[requests.Response]:
         """
         Fetch the page content from the given URL with retry logic.
-        If the request fails permanently, return None.
+        At most MAX_CONCURRENT_REQUESTS_PER_HOST requests to a host run at once.
+        Throttling responses (429/503) are retried with backoff; if they persist,
+        the HTTPError is raised. Any other failure returns None.
 
         :param url: The URL to fetch.
         :return: The Response object or None if the request fails.
         """
         try:
-            response = requests.get(url, timeout=20)
+            # Retry delays happen outside of this block, so they don't hold a slot
+            with _host_semaphore(url):
+                response = self.session.get(url, timeout=20)
             response.raise_for_status()
             return response
 
         except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code in RETRY_STATUS_CODES:
+                logging.warning(f"Server is throttling requests to {url}: {e}")
+                raise  # Let the retry decorator back off and try again
             logging.error(f"HTTP error when accessing {url}: {e}")
             return None
 
@@ -130,16 +206,10 @@ class WebScraper:
             logging.error(f"Skipping page due to repeated failures: {page_url}")
             return False, 0
 
-        soup = BeautifulSoup(response.content, "html.parser")
-        news_items = soup.find_all("article", class_="tileItem")
+        soup = BeautifulSoup(response.content, "lxml", parse_only=LISTING_STRAINER)
 
-        # Second HTML structure type
-        if not news_items:
-            news_list = soup.find("ul", class_="noticias")
-            if news_list:
-                news_items = news_list.find_all("li")
-            else:
-                news_items = []
+        # First structure: 'article.tileItem'; second structure: items of 'ul.noticias'
+        news_items = soup.select("article.tileItem") or soup.select("ul.noticias > li")
 
         items_per_page = len(news_items)
         logging.info(f"Found {items_per_page} news articles on the page")
@@ -161,27 +231,31 @@ class WebScraper:
             time.sleep(random.uniform(*SLEEP_TIME_INTERVAL))
             return True, items_per_page  # Skip this page
 
-        # Process all items on the page
+        # Process all items on the page, collecting the news whose article must be fetched
+        news_to_fetch = []
+        must_continue = True
         for item in news_items:
-            # Sleep for a random amount of time between intervals
-            time.sleep(random.uniform(*SLEEP_TIME_INTERVAL))
-
-            must_continue = self.extract_news_info(item)
+            must_continue, news = self.extract_news_info(item)
             if not must_continue:
                 # Stop if news older than min_date is found
-                return False, items_per_page
+                break
+            if news:
+                news_to_fetch.append(news)
+
+        self.fetch_articles(news_to_fetch)
 
-        return True, items_per_page
+        return must_continue, items_per_page
 
-    def extract_news_info(self, item) -> bool:
+    def extract_news_info(self, item) -> Tuple[bool, Optional[Dict]]:
         """
-        Extract the news information from an HTML element.
+        Extract the news information from an HTML element. The article content is
+        not fetched here; see fetch_articles.
 
         :param item: A BeautifulSoup tag representing a single news item.
-        :return: A boolean indicating whether to continue processing further news items.
+        :return: A tuple (continue_processing, news), where news is None if the item
+                 is skipped.
         """
-        title, url = self.extract_title_and_url(item)
-        category = self.extract_category(item)
+        # The date decides whether the item is used at all, so check it first
         news_date = self.extract_date(item)
 
         if news_date:
@@ -189,35 +263,68 @@ class WebScraper:
                 logging.info(
                     f"Stopping scrape. Found news older than min_date: {news_date}"
                 )
-                return False  # Stop processing items
+                return False, None  # Stop processing items
             if self.max_date and news_date > self.max_date:
                 logging.info(
                     f"Skipping news dated {news_date} as it is newer than max_date {self.max_date}."
                 )
-                return True  # Skip this item
+                return True, None  # Skip this item
 
+        title, url = self.extract_title_and_url(item)
+        if url in self.known_urls:
+            logging.info(f"Skipping already scraped news: {url}")
+            return True, None  # Skip this item
+
+        category = self.extract_category(item)
         tags = self.extract_tags(item)
-        content, image_url = self.get_article_content(
-            url
-        )  # Now returns (content, image)
-
-        logging.info(f"Retrieved news: {news_date} - {url} - Image: {image_url}")
-
-        self.news_data.append(
-            {
-                "title": title,
-                "url": url,
-                "published_at": news_date if news_date else None,
-                "category": category,
-                "tags": tags,
-                "content": content,
-                "image": image_url,
-                "agency": self.agency,
-                "extracted_at": datetime.now(),
-            }
+
+        # content, image and extracted_at are filled in once the article is fetched
+        news = {
+            "title": title,
+            "url": url,
+            "published_at": news_date if news_date else None,
+            "category": category,
+            "tags": tags,
+            "content": None,
+            "image": None,
+            "agency": self.agency,
+            "extracted_at": None,
+        }
+
+        return True, news  # Continue processing items
+
+    def fetch_articles(self, news_list: List[Dict]):
+        """
+        Fetch the article content of the given news concurrently and append them to
+        news_data, keeping their listing order.
+
+        :param news_list: The news extracted from a listing page.
+        """
+        if not news_list:
+            return
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ARTICLES) as executor:
+            self.news_data.extend(executor.map(self._fetch_article, news_list))
+
+    def _fetch_article(self, news: Dict) -> Dict:
+        """
+        Fetch the article of a single news item and fill in its content and image.
+
+        :param news: The news extracted from the listing page.
+        :return: The same news, completed with the article data.
+        """
+        # Sleep for a random amount of time only before actually requesting an article
+        time.sleep(random.uniform(*SLEEP_TIME_INTERVAL))
+        content, image_url = self.get_article_content(news["url"])
+
+        logging.info(
+            f"Retrieved news: {news['published_at']} - {news['url']} - Image: {image_url}"
         )
 
-        return True  # Continue processing items
+        news["content"] = content
+        news["image"] = image_url
+        news["extracted_at"] = datetime.now()
+        return news
 
     def extract_title_and_url(self, item) -> Tuple[str, str]:
         """
@@ -285,14 +392,11 @@ class WebScraper:
         date_str = date_tag.get_text().strip() if date_tag else ""
 
         if date_str:
-            date_parts = date_str.split()
-            if len(date_parts) > 1:
-                clean_date_str = date_parts[1]
-                try:
-                    return datetime.strptime(clean_date_str, "%d/%m/%Y")
-                except ValueError:
-                    logging.warning(f"Date format not recognized: {clean_date_str}")
-                    return None
+            try:
+                return self._parse_date(date_str)
+            except ValueError:
+                logging.warning(f"Date format not recognized: {date_str}")
+                return None
         return None
 
     def extract_date_2(self, item) -> Optional[datetime]:
@@ -312,11 +416,27 @@ class WebScraper:
 
         try:
             # Assuming the format is 'dd/mm/yyyy'
-            return datetime.strptime(date_str, "%d/%m/%Y")
+            return self._parse_date(date_str)
         except ValueError:
             logging.warning(f"Date format not recognized: {date_str}")
             return None
 
+    def _parse_date(self, date_str: str) -> datetime:
+        """
+        Parse the first 'dd/mm/yyyy' date found in a string, using a precompiled regex
+        and integer math instead of strptime.
+
+        :param date_str: The string containing the date (e.g. 'publicado 05/03/2024 10h30').
+        :return: The date as a datetime.datetime object.
+        :raises ValueError: If the string has no valid 'dd/mm/yyyy' date.
+        """
+        match = DATE_PATTERN.search(date_str)
+        if not match:
+            raise ValueError(f"No dd/mm/yyyy date found in '{date_str}'")
+
+        day, month, year = match.groups()
+        return datetime(int(year), int(month), int(day))
+
     def extract_tags(self, item) -> List[str]:
         """
         Extract the tags from a news item.
@@ -351,14 +471,15 @@ class WebScraper:
             if not response:
                 return "Error retrieving content", None
 
-            soup = BeautifulSoup(response.content, "html.parser")
+            soup = BeautifulSoup(response.content, "lxml", parse_only=ARTICLE_STRAINER)
             article_body = soup.find("div", id="content")
 
             if not article_body:
                 return "No content found", None
 
-            # Convert the HTML content to Markdown
-            content = md(str(article_body))
+            # Convert the HTML content to Markdown straight from the parsed tree,
+            # instead of serializing it for markdownify to parse it again
+            content = MarkdownConverter().convert_soup(article_body)
 
             # Extract the first image
             first_img = article_body.find("img")
@@ -384,7 +505,7 @@ class WebScraper:
 
         # Find the first title occurrence, marked by "=====" or "# Title"
         for i, line in enumerate(lines):
-            if re.match(r"^=+$", line.strip()) or line.startswith("# "):
+            if TITLE_UNDERLINE_PATTERN.match(line.strip()) or line.startswith("# "):
                 return "\n".join(
                     lines[i - 1 :]
                 )  # Keep the title and everything after it
@@ -7,3 +7,7 @@ import sys
 current_dir = os.path.dirname(__file__)
 project_root = os.path.abspath(os.path.join(current_dir, ".."))
 sys.path.insert(0, project_root)
+
+# Modules under src/ import each other relative to it (e.g. `from dataset_manager import
+# DatasetManager`), so src/ must be importable as well.
+sys.path.insert(1, os.path.join(project_root, "src"))
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+from datasets import Dataset
+
+import src.dataset_manager as dataset_manager
+from src.dataset_manager import DatasetManager
+
+
+def _rows(*unique_ids: str) -> dict:
+    """Helper function to build dataset columns with one row per unique_id."""
+    return {
+        "unique_id": list(unique_ids),
+        "agency": ["gestao"] * len(unique_ids),
+        "published_at": [datetime(2024, 3, 5)] * len(unique_ids),
+        "title": [f"Title {uid}" for uid in unique_ids],
+        "url": [f"https://www.gov.br/gestao/{uid}" for uid in unique_ids],
+    }
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Fixture that stubs load_dataset with an existing dataset and records calls."""
+    calls = []
+
+    def fake_load_dataset(path, split):
+        calls.append(path)
+        return Dataset.from_dict(_rows("a", "b"))
+
+    monkeypatch.setattr(dataset_manager, "load_dataset", fake_load_dataset)
+    return calls
+
+
+@pytest.fixture
+def pushes(monkeypatch):
+    """Fixture that stubs the Hub uploads and records every pushed DataFrame."""
+    calls = []
+    monkeypatch.setattr(
+        DatasetManager,
+        "_push_dataset_and_csvs",
+        lambda self, dataset, df: calls.append(df),
+    )
+    return calls
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Fixture that supplies a DatasetManager without a real Hugging Face token."""
+    monkeypatch.setattr(dataset_manager.HfFolder, "get_token", lambda: "token")
+    return DatasetManager()
+
+
+class TestLoadExistingDataset:
+    def test_dataset_is_loaded_only_once(self, manager, loads, pushes):
+        assert manager.get_existing_urls() == {
+            "https://www.gov.br/gestao/a",
+            "https://www.gov.br/gestao/b",
+        }
+        manager.insert(_rows("c"))
+        manager.insert(_rows("d"))
+
+        assert loads == [dataset_manager.DATASET_PATH]
+        assert len(pushes) == 2
+
+
+class TestInsert:
+    def test_all_duplicates_are_not_pushed(self, manager, loads, pushes):
+        manager.insert(_rows("a", "b"))
+
+        assert pushes == []
+
+    def test_duplicates_are_pushed_when_updates_are_allowed(
+        self, manager, loads, pushes
+    ):
+        new_data = _rows("a", "b")
+        new_data["title"] = ["New title a", "New title b"]
+
+        manager.insert(new_data, allow_update=True)
+
+        assert len(pushes) == 1
+        assert sorted(pushes[0]["title"]) == ["New title a", "New title b"]
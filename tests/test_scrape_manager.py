@@ -0,0 +1,45 @@
+from datetime import date
+
+import pytest
+
+from scraper.scrape_manager import ScrapeManager
+
+
+@pytest.fixture
+def manager():
+    """Fixture that supplies a ScrapeManager without a dataset manager."""
+    return ScrapeManager(dataset_manager=None)
+
+
+def _news(title: str, url: str) -> dict:
+    """Helper function to build a scraped news item."""
+    return {
+        "title": title,
+        "url": url,
+        "published_at": date(2024, 3, 5),
+        "category": "Noticias",
+        "tags": [],
+        "content": f"Content of {url}",
+        "image": None,
+        "agency": "gestao",
+        "extracted_at": None,
+    }
+
+
+class TestPreprocessData:
+    def test_duplicated_news_keep_the_first_item(self, manager):
+        data = [
+            _news("Noticia 1", "https://www.gov.br/gestao/noticia-1"),
+            _news("Noticia 2", "https://www.gov.br/gestao/noticia-2"),
+            _news("Noticia 1", "https://www.gov.br/gestao/noticia-1-copia"),
+        ]
+
+        columns = manager._preprocess_data(data)
+
+        assert columns["url"] == [
+            "https://www.gov.br/gestao/noticia-1",
+            "https://www.gov.br/gestao/noticia-2",
+        ]
+        assert len(set(columns["unique_id"])) == 2
+        assert list(columns)[:3] == ["unique_id", "agency", "published_at"]
+        assert all(len(values) == 2 for values in columns.values())
@@ -0,0 +1,188 @@
+import logging
+import threading
+from datetime import date
+
+import pytest
+import requests
+import retry.api
+from bs4 import BeautifulSoup
+
+import src.scraper.webscraper as webscraper
+from src.scraper.webscraper import WebScraper, _host_semaphore
+
+
+@pytest.fixture
+def scraper():
+    """Fixture that supplies a scraper for a sample agency (no request is made)."""
+    return WebScraper("2024-01-01", "https://www.gov.br/gestao/pt-br/assuntos/noticias")
+
+
+def _news_item(html: str):
+    """Helper function to parse the HTML of a single listing item."""
+    return BeautifulSoup(html, "lxml")
+
+
+class TestExtractDate:
+    @pytest.mark.parametrize(
+        "html, expected",
+        [
+            (
+                '<span class="documentByLine">publicado 05/03/2024 10h30</span>',
+                date(2024, 3, 5),
+            ),
+            (
+                '<span class="documentByLine">Publicado em 5/3/2024</span>',
+                date(2024, 3, 5),
+            ),
+            ('<span class="data">28/02/2024</span>', date(2024, 2, 28)),
+            ('<span class="data">31/02/2024</span>', None),
+            ('<span class="documentByLine">publicado ontem</span>', None),
+            ("<p>No date</p>", None),
+        ],
+    )
+    def test_extract_date(self, scraper, html, expected):
+        assert scraper.extract_date(_news_item(html)) == expected
+
+
+class TestHostSemaphore:
+    def test_requests_to_the_same_host_share_a_semaphore(self):
+        gestao = _host_semaphore("https://www.gov.br/gestao/pt-br/assuntos/noticias")
+        saude = _host_semaphore("https://www.gov.br/saude/pt-br/assuntos/noticias")
+        other = _host_semaphore("https://example.com/noticias")
+
+        assert gestao is saude
+        assert gestao is not other
+
+
+def _response(status_code: int, body: str = "") -> requests.Response:
+    """Helper function to build a response with the given status and body."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://www.gov.br/gestao/pt-br/assuntos/noticias"
+    response._content = body.encode()
+    return response
+
+
+class _FakeGet:
+    """Stand-in for Session.get that answers with queued responses."""
+
+    def __init__(self):
+        self.responses = []
+        self.requested = []
+
+    def __call__(self, url, **kwargs):
+        self.requested.append(url)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def fake_get(scraper, monkeypatch):
+    """Fixture that stubs the scraper's session, without waiting between retries."""
+    fake = _FakeGet()
+    monkeypatch.setattr(scraper.session, "get", fake)
+    monkeypatch.setattr(retry.api.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(webscraper, "SLEEP_TIME_INTERVAL", (0, 0))
+    return fake
+
+
+class TestFetchPage:
+    def test_throttled_request_is_retried(self, scraper, fake_get):
+        fake_get.responses.extend([_response(503), _response(200, "ok")])
+
+        response = scraper.fetch_page(scraper.base_url)
+
+        assert response.status_code == 200
+        assert len(fake_get.requested) == 2
+
+    def test_other_http_errors_are_not_retried(self, scraper, fake_get):
+        fake_get.responses.extend([_response(404), _response(200, "ok")])
+
+        assert scraper.fetch_page(scraper.base_url) is None
+        assert len(fake_get.requested) == 1
+
+    def test_persistent_throttling_skips_the_agency(self, scraper, fake_get, caplog):
+        fake_get.responses.extend([_response(503) for _ in range(5)])
+
+        with caplog.at_level(logging.ERROR):
+            assert scraper.scrape_news() == []
+
+        assert len(fake_get.requested) == 5
+        assert "Skipping agency gestao due to persistent HTTP error" in caplog.text
+
+
+LISTING_PAGE = """
+<html><body><div id="content-core">
+  <article class="tileItem">
+    <a class="summary url" href="https://www.gov.br/gestao/noticia-1">Noticia 1</a>
+    <span class="documentByLine">publicado 10/03/2024 09h00</span>
+  </article>
+  <article class="tileItem">
+    <a class="summary url" href="https://www.gov.br/gestao/noticia-2">Noticia 2</a>
+    <span class="documentByLine">publicado 08/03/2024 09h00</span>
+  </article>
+  <article class="tileItem">
+    <a class="summary url" href="https://www.gov.br/gestao/noticia-3">Noticia 3</a>
+    <span class="documentByLine">publicado 05/03/2024 09h00</span>
+  </article>
+  <article class="tileItem">
+    <a class="summary url" href="https://www.gov.br/gestao/noticia-4">Noticia 4</a>
+    <span class="documentByLine">publicado 20/12/2023 09h00</span>
+  </article>
+</div></body></html>
+"""
+
+
+class TestScrapeNews:
+    def test_news_keep_listing_order_and_stop_at_min_date(
+        self, scraper, fake_get, monkeypatch
+    ):
+        fake_get.responses.append(_response(200, LISTING_PAGE))
+        last_fetched = threading.Event()
+        fetched = []
+
+        def fake_get_article_content(url):
+            # The first article finishes last, so the completion order differs
+            # from the listing order
+            if url.endswith("noticia-1"):
+                last_fetched.wait(timeout=5)
+            elif url.endswith("noticia-3"):
+                last_fetched.set()
+            fetched.append(url)
+            return f"Content of {url}", None
+
+        monkeypatch.setattr(scraper, "get_article_content", fake_get_article_content)
+
+        news_data = scraper.scrape_news()
+
+        assert [news["title"] for news in news_data] == [
+            "Noticia 1",
+            "Noticia 2",
+            "Noticia 3",
+        ]
+        assert [news["content"] for news in news_data] == [
+            f"Content of {news['url']}" for news in news_data
+        ]
+        assert fetched.index(news_data[0]["url"]) > fetched.index(news_data[2]["url"])
+        assert len(fake_get.requested) == 1
+
+    def test_known_urls_are_not_fetched_again(self, fake_get, monkeypatch):
+        known_url = "https://www.gov.br/gestao/noticia-2"
+        scraper = WebScraper(
+            "2024-01-01",
+            "https://www.gov.br/gestao/pt-br/assuntos/noticias",
+            known_urls={known_url},
+        )
+        monkeypatch.setattr(scraper.session, "get", fake_get)
+        fake_get.responses.append(_response(200, LISTING_PAGE))
+        fetched = []
+
+        def fake_get_article_content(url):
+            fetched.append(url)
+            return f"Content of {url}", None
+
+        monkeypatch.setattr(scraper, "get_article_content", fake_get_article_content)
+
+        news_data = scraper.scrape_news()
+
+        assert known_url not in fetched
+        assert [news["title"] for news in news_data] == ["Noticia 1", "Noticia 3"]